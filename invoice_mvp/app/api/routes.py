@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
+import orjson
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, Query
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 
 from ..core import ProcessedInvoice
 from ..services.ocr_client import OCRClient
@@ -17,6 +19,16 @@ from tests.mocks import MockOCRClient
 
 router = APIRouter()
 
+# The demo UI is static, so it is read once at import time. Set DEV_RELOAD_UI
+# to re-read it on every request while editing the page.
+_UI_PATH = Path(__file__).resolve().parent.parent / "ui" / "index.html"
+_UI_HTML: Optional[bytes] = _UI_PATH.read_bytes() if _UI_PATH.exists() else None
+
+
+def _json_response(payload: Any) -> Response:
+    """Serialize plain dict/list payloads with orjson, bypassing jsonable_encoder."""
+    return Response(orjson.dumps(payload), media_type="application/json")
+
 
 async def get_ocr_client() -> OCRClient:
     # Single-line switch between mock and Tesseract-backed implementation.
@@ -46,9 +58,10 @@ async def process_invoice(
     file: UploadFile = File(...),
     processor: InvoiceProcessor = Depends(get_invoice_processor),
 ) -> ProcessedInvoice:
-    contents = await file.read()
     try:
-        result = await processor.process_invoice_file(contents, file.filename)
+        # Hand over Starlette's spooled temp file instead of reading the whole
+        # upload into memory; downstream consumers stream from it.
+        result = await processor.process_invoice_file(file.file, file.filename)
     except Exception as exc:  # noqa: BLE001 - expose error detail for debugging/demo
         # Surface the underlying error message so the demo UI and API clients
         # can see what went wrong. In a hardened production API this mapping
@@ -58,21 +71,22 @@ async def process_invoice(
 
 
 @router.get("/providers")
-async def get_providers():
+async def get_providers() -> Response:
     """Get available extraction providers."""
-    return {
+    return _json_response({
         "available": SmartExtractorFactory.get_available_providers(),
         "recommended": SmartExtractorFactory.get_recommended_provider(),
-    }
+    })
 
 
 @router.get("/metrics")
-async def get_metrics():
+async def get_metrics() -> Response:
     """Get extraction metrics and statistics."""
-    return {
+    return _json_response({
         "provider_stats": metrics_collector.get_provider_stats(),
         "recent_extractions": metrics_collector.get_recent_extractions(),
-    }
+        "cache_stats": metrics_collector.get_cache_stats(),
+    })
 
 
 @router.get("/", response_class=HTMLResponse)
@@ -83,9 +97,11 @@ async def ui_index() -> HTMLResponse:
     and demo purposes. The core API remains fully usable without it.
     """
 
-    ui_path = Path(__file__).resolve().parent.parent / "ui" / "index.html"
-    if not ui_path.exists():
+    html = _UI_HTML
+    if os.getenv("DEV_RELOAD_UI"):
+        html = _UI_PATH.read_bytes() if _UI_PATH.exists() else None
+    if html is None:
         return HTMLResponse("<h1>UI not found</h1>", status_code=404)
 
-    return HTMLResponse(ui_path.read_text(encoding="utf-8"))
+    return HTMLResponse(html)
 
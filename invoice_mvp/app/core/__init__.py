@@ -14,6 +14,10 @@ from .models import (
     InvoiceExtraction,
     InvoiceDocumentDetails,
     InvoiceFinancialSummary,
+    InvoicePartyDict,
+    InvoiceLineItemDict,
+    InvoiceTotalsDict,
+    ExtractedInvoiceDict,
 )
 
 __all__ = [
@@ -30,4 +34,8 @@ __all__ = [
     "InvoiceExtraction",
     "InvoiceDocumentDetails",
     "InvoiceFinancialSummary",
+    "InvoicePartyDict",
+    "InvoiceLineItemDict",
+    "InvoiceTotalsDict",
+    "ExtractedInvoiceDict",
 ]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, TypedDict
 
 from pydantic import BaseModel, Field
 
@@ -80,6 +80,35 @@ class ProcessedInvoice(BaseModel):
     validation: InvoiceValidationResult
 
 
+# Plain-dict shapes produced by the OCR/OpenAI/mock extractors. They travel
+# through the pipeline unvalidated and only become models in the orchestrator.
+class InvoicePartyDict(TypedDict, total=False):
+    name: str
+    rut: str
+    address: str
+
+
+class InvoiceLineItemDict(TypedDict, total=False):
+    rubro_code: Optional[str]
+    rubro_raw: str
+    quantity: float
+    unit_price: float
+    subtotal: float
+
+
+class InvoiceTotalsDict(TypedDict):
+    subtotal: float
+    iva: float
+    iva_rate: float
+    total: float
+
+
+class ExtractedInvoiceDict(TypedDict, total=False):
+    provider: InvoicePartyDict
+    line_items: List[InvoiceLineItemDict]
+    totals: InvoiceTotalsDict
+
+
 class RubroNomenclatorEntry(BaseModel):
     code: str
     name: str
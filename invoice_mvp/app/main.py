@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.routes import router as api_router
+from .services.extractors import LlamaInvoiceExtractor
+from .services.metrics import metrics_collector
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Release pooled provider connections and persist buffered metrics.
+    await LlamaInvoiceExtractor.aclose()
+    metrics_collector.flush()
 
 
 def create_app() -> FastAPI:
@@ -13,7 +26,7 @@ def create_app() -> FastAPI:
     simple while staying compatible with serverless deployments.
     """
 
-    app = FastAPI(title="Invoice Processing MVP", version="0.1.0")
+    app = FastAPI(title="Invoice Processing MVP", version="0.1.0", lifespan=lifespan)
 
     # Basic CORS for demo UI; tighten in real deployments.
     app.add_middleware(
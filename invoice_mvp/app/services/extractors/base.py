@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Optional
 from dataclasses import dataclass
-from time import time
+from time import perf_counter_ns
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionMetrics:
     """Metrics for extraction performance."""
     provider: str
@@ -24,14 +24,15 @@ class InvoiceExtractor(ABC):
     @abstractmethod
     async def extract(
         self, 
-        file_bytes: bytes, 
+        file: BinaryIO, 
         filename: str,
         ocr_text: Optional[str] = None
     ) -> Dict[str, Any]:
         """Extract structured invoice data from file.
         
         Args:
-            file_bytes: Raw file bytes (PDF/image)
+            file: Binary stream of the original file (PDF/image); providers
+                that read it must seek(0) first since it is shared
             filename: Original filename
             ocr_text: Pre-extracted OCR text (optional, for providers that need it)
             
@@ -47,17 +48,17 @@ class InvoiceExtractor(ABC):
 
     async def extract_with_metrics(
         self, 
-        file_bytes: bytes, 
+        file: BinaryIO, 
         filename: str,
         ocr_text: Optional[str] = None
     ) -> tuple[Dict[str, Any], ExtractionMetrics]:
         """Extract data and return metrics."""
-        start_time = time()
+        start_ns = perf_counter_ns()
         provider_name = self.get_provider_name()
         
         try:
-            result = await self.extract(file_bytes, filename, ocr_text)
-            processing_time = time() - start_time
+            result = await self.extract(file, filename, ocr_text)
+            processing_time = (perf_counter_ns() - start_ns) / 1e9
             
             metrics = ExtractionMetrics(
                 provider=provider_name,
@@ -68,7 +69,7 @@ class InvoiceExtractor(ABC):
             return result, metrics
             
         except Exception as e:
-            processing_time = time() - start_time
+            processing_time = (perf_counter_ns() - start_ns) / 1e9
             
             metrics = ExtractionMetrics(
                 provider=provider_name,
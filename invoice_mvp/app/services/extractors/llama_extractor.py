@@ -2,18 +2,99 @@
 
 from __future__ import annotations
 
+import asyncio
+import mimetypes
 import os
 import json
-import io
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Any, BinaryIO, ClassVar, Dict, Optional
 import httpx
+import orjson
 
 from .base import InvoiceExtractor, ExtractionMetrics
 
+# Extraction schema for the invoice_parser agent (mirrors core.InvoiceExtraction).
+_DATA_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "seller": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Seller name"},
+                "rut": {"type": "string", "description": "Seller RUT"},
+                "address": {"type": "string", "description": "Seller address"},
+            },
+        },
+        "buyer": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Buyer name"},
+                "rut": {"type": "string", "description": "Buyer RUT"},
+                "address": {"type": "string", "description": "Buyer address"},
+                "type": {"type": "string", "description": "Invoice type"},
+            },
+        },
+        "document_details": {
+            "type": "object",
+            "properties": {
+                "series": {"type": "string", "description": "Invoice series"},
+                "number": {"type": "string", "description": "Invoice number"},
+                "issue_date": {"type": "string", "description": "Issue date"},
+                "due_date": {"type": "string", "description": "Due date"},
+                "project_number": {"type": "string", "description": "Project number"},
+                "general_description": {"type": "string", "description": "General description"},
+            },
+        },
+        "line_items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "item_number": {"type": ["string", "null"], "description": "Item number"},
+                    "description": {"type": "string", "description": "Item description"},
+                    "quantity": {"type": "integer", "description": "Quantity"},
+                    "unit_of_measure": {"type": "string", "description": "Unit of measure"},
+                    "order_number": {"type": "string", "description": "Order number"},
+                },
+            },
+        },
+        "financial_summary": {
+            "type": "object",
+            "properties": {
+                "sub_total": {"type": "integer", "description": "Subtotal"},
+                "iva_amount": {"type": "integer", "description": "IVA amount"},
+                "total_amount": {"type": "integer", "description": "Total amount"},
+            },
+        },
+    },
+}
+
+# Agent creation body, serialized once at import instead of per call.
+_AGENT_CREATE_BODY: bytes = orjson.dumps({
+    "name": "invoice_parser",
+    "data_schema": _DATA_SCHEMA,
+    "config": {
+        "extraction_target": "PER_DOC",
+        "extraction_mode": "BALANCED",
+    },
+})
+
+
+@lru_cache(maxsize=128)
+def _content_type(filename: str) -> str:
+    """Guess the upload MIME type from the filename (PDF, PNG, JPEG, ...)."""
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
 
 class LlamaInvoiceExtractor(InvoiceExtractor):
     """Llama Cloud extraction implementation."""
 
+    # Shared across instances so TCP/TLS connections survive between requests.
+    _client: ClassVar[Optional[httpx.AsyncClient]] = None
+    # The invoice_parser agent id is looked up once per process, not per request.
+    _agent_id: ClassVar[Optional[str]] = None
+    _agent_lock: ClassVar[asyncio.Lock] = asyncio.Lock()
+
     def __init__(self, model: str = "default") -> None:
         api_key = os.getenv("LLAMA_API_KEY")
         if not api_key:
@@ -22,116 +103,71 @@ class LlamaInvoiceExtractor(InvoiceExtractor):
         self._api_key = api_key
         self._base_url = "https://api.cloud.llamaindex.ai/api/v1"
         self._model = model
-        self._agent_id = None
 
     def get_provider_name(self) -> str:
         return "llama_cloud"
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it on first use."""
+        cls = type(self)
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=10),
+            )
+        return cls._client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the pooled HTTP client (called on application shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
     async def _ensure_agent(self) -> str:
         """Create or reuse an extraction agent for invoices."""
-        if self._agent_id:
-            return self._agent_id
+        cls = type(self)
+        if cls._agent_id:
+            return cls._agent_id
+
+        async with cls._agent_lock:
+            # Another request may have resolved the agent while we waited.
+            if not cls._agent_id:
+                cls._agent_id = await self._find_or_create_agent()
+            return cls._agent_id
 
+    async def _find_or_create_agent(self) -> str:
+        """Look up the invoice_parser agent by name, creating it if missing."""
         headers = {
             "accept": "application/json",
             "Authorization": f"Bearer {self._api_key}",
             "Content-Type": "application/json",
         }
 
+        client = self._get_client()
+
         # List existing agents
-        async with httpx.AsyncClient() as client:
-            list_response = await client.get(
-                f"{self._base_url}/extraction/extraction-agents",
-                headers=headers,
-                timeout=30.0,
-            )
-            list_response.raise_for_status()
-            agents = list_response.json()
-            for agent in agents:
-                if agent.get("name") == "invoice_parser":
-                    self._agent_id = agent["id"]
-                    return self._agent_id
+        list_response = await client.get("/extraction/extraction-agents", headers=headers)
+        list_response.raise_for_status()
+        agents = list_response.json()
+        for agent in agents:
+            if agent.get("name") == "invoice_parser":
+                return agent["id"]
 
         # Create new agent if not found
-        data_schema = {
-            "type": "object",
-            "properties": {
-                "seller": {
-                    "type": "object",
-                    "properties": {
-                        "name": {"type": "string", "description": "Seller name"},
-                        "rut": {"type": "string", "description": "Seller RUT"},
-                        "address": {"type": "string", "description": "Seller address"},
-                    },
-                },
-                "buyer": {
-                    "type": "object",
-                    "properties": {
-                        "name": {"type": "string", "description": "Buyer name"},
-                        "rut": {"type": "string", "description": "Buyer RUT"},
-                        "address": {"type": "string", "description": "Buyer address"},
-                        "type": {"type": "string", "description": "Invoice type"},
-                    },
-                },
-                "document_details": {
-                    "type": "object",
-                    "properties": {
-                        "series": {"type": "string", "description": "Invoice series"},
-                        "number": {"type": "string", "description": "Invoice number"},
-                        "issue_date": {"type": "string", "description": "Issue date"},
-                        "due_date": {"type": "string", "description": "Due date"},
-                        "project_number": {"type": "string", "description": "Project number"},
-                        "general_description": {"type": "string", "description": "General description"},
-                    },
-                },
-                "line_items": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "item_number": {"type": ["string", "null"], "description": "Item number"},
-                            "description": {"type": "string", "description": "Item description"},
-                            "quantity": {"type": "integer", "description": "Quantity"},
-                            "unit_of_measure": {"type": "string", "description": "Unit of measure"},
-                            "order_number": {"type": "string", "description": "Order number"},
-                        },
-                    },
-                },
-                "financial_summary": {
-                    "type": "object",
-                    "properties": {
-                        "sub_total": {"type": "integer", "description": "Subtotal"},
-                        "iva_amount": {"type": "integer", "description": "IVA amount"},
-                        "total_amount": {"type": "integer", "description": "Total amount"},
-                    },
-                },
-            },
-        }
-
-        payload = {
-            "name": "invoice_parser",
-            "data_schema": data_schema,
-            "config": {
-                "extraction_target": "PER_DOC",
-                "extraction_mode": "BALANCED",
-            },
-        }
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self._base_url}/extraction/extraction-agents",
-                headers=headers,
-                json=payload,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            agent = response.json()
-            self._agent_id = agent["id"]
-            return self._agent_id
+        response = await client.post(
+            "/extraction/extraction-agents",
+            headers=headers,
+            content=_AGENT_CREATE_BODY,
+        )
+        response.raise_for_status()
+        agent = response.json()
+        return agent["id"]
 
     async def extract(
         self, 
-        file_bytes: bytes, 
+        file: BinaryIO, 
         filename: str,
         ocr_text: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -143,78 +179,77 @@ class LlamaInvoiceExtractor(InvoiceExtractor):
             "Authorization": f"Bearer {self._api_key}",
         }
 
-        # Upload original file
-        file_buffer = io.BytesIO(file_bytes)
-        content_type = "application/pdf" if filename.lower().endswith(".pdf") else "image/jpeg"
-        files = {"upload_file": (filename, file_buffer, content_type)}
+        # Upload original file, streamed from the (possibly already read) upload
+        file.seek(0)
+        content_type = _content_type(filename)
+        files = {"upload_file": (filename, file, content_type)}
         data = {"purpose": "extract"}
 
-        async with httpx.AsyncClient() as client:
-            # Upload file
-            upload_response = await client.post(
-                f"{self._base_url}/files",
-                headers=headers,
-                files=files,
-                data=data,
-                timeout=30.0,
-            )
-            upload_response.raise_for_status()
-            file_obj = upload_response.json()
-            file_id = file_obj["id"]
-
-            # Start extraction job
-            job_payload = {
-                "extraction_agent_id": agent_id,
-                "file_id": file_id,
-            }
-            job_response = await client.post(
-                f"{self._base_url}/extraction/jobs",
+        client = self._get_client()
+
+        # Upload file
+        upload_response = await client.post(
+            "/files",
+            headers=headers,
+            files=files,
+            data=data,
+        )
+        upload_response.raise_for_status()
+        file_obj = upload_response.json()
+        file_id = file_obj["id"]
+
+        # Start extraction job
+        job_payload = {
+            "extraction_agent_id": agent_id,
+            "file_id": file_id,
+        }
+        job_response = await client.post(
+            "/extraction/jobs",
+            headers=headers,
+            json=job_payload,
+        )
+        job_response.raise_for_status()
+        job = job_response.json()
+        job_id = job["id"]
+
+        # Poll for completion with exponential backoff: quick jobs are picked up
+        # within half a second, long ones are polled at most every 5s.
+        max_wait = 180.0
+        interval = 0.5
+        max_interval = 5.0
+        waited = 0.0
+        while waited < max_wait:
+            status_response = await client.get(
+                f"/extraction/jobs/{job_id}",
                 headers=headers,
-                json=job_payload,
-                timeout=30.0,
             )
-            job_response.raise_for_status()
-            job = job_response.json()
-            job_id = job["id"]
-
-            # Poll for completion
-            import asyncio
-            max_wait = 180
-            interval = 3
-            waited = 0
-            while waited < max_wait:
-                status_response = await client.get(
-                    f"{self._base_url}/extraction/jobs/{job_id}",
+            status_response.raise_for_status()
+            status = status_response.json()
+            job_status = status.get("status")
+
+            if job_status in {"completed", "SUCCESS"}:
+                # Get result
+                result_response = await client.get(
+                    f"/extraction/jobs/{job_id}/result",
                     headers=headers,
-                    timeout=30.0,
                 )
-                status_response.raise_for_status()
-                status = status_response.json()
-                job_status = status.get("status")
-
-                if job_status in {"completed", "SUCCESS"}:
-                    # Get result
-                    result_response = await client.get(
-                        f"{self._base_url}/extraction/jobs/{job_id}/result",
-                        headers=headers,
-                        timeout=30.0,
-                    )
-                    result_response.raise_for_status()
-                    result = result_response.json()
+                result_response.raise_for_status()
+                result = result_response.json()
 
-                    # Unpack if list
-                    if isinstance(result, list) and len(result) == 1:
-                        result = result[0]
+                # Unpack if list
+                if isinstance(result, list) and len(result) == 1:
+                    result = result[0]
 
-                    return result
+                return result
 
-                elif job_status in {"failed", "cancelled"}:
-                    raise RuntimeError(f"Extraction job failed: {status}")
+            elif job_status in {"failed", "cancelled"}:
+                raise RuntimeError(f"Extraction job failed: {status}")
 
-                await asyncio.sleep(interval)
-                waited += interval
+            await asyncio.sleep(interval)
+            waited += interval
+            interval = min(interval * 1.5, max_interval)
 
-            raise RuntimeError(f"Extraction job timed out after {max_wait}s")
+        raise RuntimeError(f"Extraction job timed out after {max_wait:.0f}s")
 
     def _extract_confidence(self, result: Dict[str, Any]) -> Optional[Dict[str, float]]:
         """Extract confidence from Llama metadata if available."""
@@ -2,11 +2,48 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
-from typing import Dict, Any, Optional
+from typing import Any, BinaryIO, Dict, List, Optional
 
+from ...core import InvoiceLineItemDict, InvoiceTotalsDict
 from .base import InvoiceExtractor, ExtractionMetrics
 
+# Patterns are compiled once at import time and shared by every extraction.
+# RUT: XX.XXX.XXX-X or XXXXXXXX-X. One alternation, so the first RUT in the
+# text wins whichever format it uses (dotted RUTs no longer take precedence).
+_RUT_RE = re.compile(r'\b(?:\d{1,2}\.\d{3}\.\d{3}|\d{7,8})-[0-9Kk]\b')
+# Subtotal, total and IVA in one alternation so the text is scanned once.
+# Each branch has a single named group, so match.lastgroup names the field.
+# The first match per field in text order wins, so an earlier "Total General"
+# beats a later plain "Total" (previously pattern order decided).
+_TOTALS_RE = re.compile(
+    r'(?:SUBTOTAL|BASE\s+IMPONIBLE)[:\s]*\$?\s*(?P<subtotal>\d+(?:\.\d+)?)'
+    r'|(?:IMPORTE\s+)?\bTOTAL(?:\s+GENERAL)?[:\s]*\$?\s*(?P<total>\d+(?:\.\d+)?)'
+    r'|IVA[:\s]*\$?\s*(?P<iva>\d+(?:\.\d+)?)',
+    re.IGNORECASE,
+)
+# Quantity, description and the first number inside the description (price)
+# captured in one search; equivalent to matching the item and then searching
+# the description for a price separately.
+_LINE_ITEM_RE = re.compile(
+    r'(?P<qty>\d+)\s+[xX\s]*(?P<desc>(?=.)\D*(?P<price>\d+(?:\.\d+)?)?.*)'
+)
+_PRICE_RE = re.compile(r'\$?(\d+(?:\.\d+)?)')
+
+# Provider name: a line without header words whose stripped text has at least
+# two words and more than 10 characters. Searched with endpos limited to the
+# first few lines of the document.
+_PROVIDER_NAME_RE = re.compile(
+    r'^(?![^\n]*(?:FACTURA|INVOICE|RUT:|TOTAL))[^\S\n]*'
+    r'(?P<name>(?=\S*[^\S\n]+\S)\S[^\n]{9,}\S)[^\S\n]*$',
+    re.IGNORECASE | re.MULTILINE,
+)
+_PROVIDER_NAME_MAX_LINES = 5
+
+# Header/footer words that disqualify a line as a line item.
+_LINE_ITEM_HEADER_RE = re.compile(r'DESCRIPCIÓN|CANTIDAD|PRECIO|TOTAL|IVA', re.IGNORECASE)
+
 
 class OCRInvoiceExtractor(InvoiceExtractor):
     """OCR-only extraction implementation (Tesseract output processing)."""
@@ -19,7 +56,7 @@ class OCRInvoiceExtractor(InvoiceExtractor):
 
     async def extract(
         self, 
-        file_bytes: bytes, 
+        file: BinaryIO, 
         filename: str,
         ocr_text: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -27,6 +64,12 @@ class OCRInvoiceExtractor(InvoiceExtractor):
         if not ocr_text:
             raise ValueError("OCR extractor requires OCR text")
 
+        # Pure CPU-bound regex work: run it off the event loop so long OCR
+        # texts don't stall other requests.
+        return await asyncio.to_thread(self._extract_sync, ocr_text)
+
+    def _extract_sync(self, ocr_text: str) -> Dict[str, Any]:
+        """Synchronous body of extract(), safe to run in a worker thread."""
         # Clean and normalize OCR text
         text = ocr_text.strip()
         
@@ -52,109 +95,72 @@ class OCRInvoiceExtractor(InvoiceExtractor):
 
     def _extract_provider_name(self, text: str) -> str:
         """Extract provider name using common patterns."""
-        lines = text.split('\n')
-        for line in lines[:5]:  # Usually in first few lines
-            line = line.strip()
-            # Skip common headers
-            if any(word in line.upper() for word in ['FACTURA', 'INVOICE', 'RUT:', 'TOTAL']):
-                continue
-            # Look for name-like patterns (multiple words, proper case)
-            if len(line.split()) >= 2 and len(line) > 10:
-                return line
-        return ""
+        # Usually in the first few lines: find where they end, then let a
+        # single regex search skip headers and pick the first name-like line.
+        end = -1
+        for _ in range(_PROVIDER_NAME_MAX_LINES):
+            end = text.find('\n', end + 1)
+            if end == -1:
+                end = len(text)
+                break
+        match = _PROVIDER_NAME_RE.search(text, 0, end)
+        return match["name"] if match else ""
 
     def _extract_rut(self, text: str) -> str:
         """Extract RUT using Chilean/Uruguayan format patterns."""
-        # Pattern: XX.XXX.XXX-X or XXXXXXXX-X
-        rut_patterns = [
-            r'\b\d{1,2}\.\d{3}\.\d{3}-[0-9Kk]\b',
-            r'\b\d{7,8}-[0-9Kk]\b',
-        ]
-        
-        for pattern in rut_patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group()
-        return ""
+        match = _RUT_RE.search(text)
+        return match.group() if match else ""
 
-    def _extract_totals(self, text: str) -> Dict[str, Any]:
+    def _extract_totals(self, text: str) -> InvoiceTotalsDict:
         """Extract financial totals."""
-        totals = {
+        totals: InvoiceTotalsDict = {
             "subtotal": 0.0,
             "iva": 0.0,
             "iva_rate": 0.0,
             "total": 0.0,
         }
         
-        # Look for total amount
-        total_patterns = [
-            r'TOTAL[:\s]*\$?[\s]*(\d+(?:\.\d+)?)',
-            r'TOTAL GENERAL[:\s]*\$?[\s]*(\d+(?:\.\d+)?)',
-            r'IMPORTE TOTAL[:\s]*\$?[\s]*(\d+(?:\.\d+)?)',
-        ]
-        
-        for pattern in total_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                totals["total"] = float(match.group(1))
-                break
-        
-        # Look for subtotal
-        subtotal_patterns = [
-            r'SUBTOTAL[:\s]*\$?[\s]*(\d+(?:\.\d+)?)',
-            r'BASE IMPONIBLE[:\s]*\$?[\s]*(\d+(?:\.\d+)?)',
-        ]
-        
-        for pattern in subtotal_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                totals["subtotal"] = float(match.group(1))
-                break
-        
-        # Look for IVA/IVA amount
-        iva_patterns = [
-            r'IVA[:\s]*\$?[\s]*(\d+(?:\.\d+)?)',
-            r'IVA[\s]*(\d+(?:\.\d+)?)',
-            r'IVA[\s]*\$?[\s]*(\d+(?:\.\d+)?)',
-        ]
-        
-        for pattern in iva_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                totals["iva"] = float(match.group(1))
+        # Single pass; the first occurrence of each field wins.
+        found = set()
+        for match in _TOTALS_RE.finditer(text):
+            field = match.lastgroup
+            if field in found:
+                continue
+            totals[field] = float(match.group(field))
+            found.add(field)
+            if len(found) == 3:
                 break
-        
+
         # Calculate IVA rate if we have both subtotal and IVA
         if totals["subtotal"] > 0 and totals["iva"] > 0:
             totals["iva_rate"] = round(totals["iva"] / totals["subtotal"], 4)
         
         return totals
 
-    def _extract_line_items(self, text: str) -> list:
+    def _extract_line_items(self, text: str) -> List[InvoiceLineItemDict]:
         """Extract basic line items."""
-        items = []
-        lines = text.split('\n')
+        items: List[InvoiceLineItemDict] = []
+        lines = text.splitlines()
         
         # Simple pattern: look for lines with quantities and descriptions
         for i, line in enumerate(lines):
             line = line.strip()
             # Skip headers and footers
-            if any(word in line.upper() for word in ['DESCRIPCIÓN', 'CANTIDAD', 'PRECIO', 'TOTAL', 'IVA']):
+            if _LINE_ITEM_HEADER_RE.search(line):
                 continue
             
             # Look for patterns like "2 Servicio $1000" or "1x Item"
-            item_match = re.search(r'(\d+)\s+[xX\s]*(.+)', line)
+            item_match = _LINE_ITEM_RE.search(line)
             if item_match:
-                quantity = int(item_match.group(1))
-                description = item_match.group(2).strip()
+                quantity = int(item_match["qty"])
+                description = item_match["desc"].strip()
                 
-                # Try to extract price from description or next line
+                # Price from the description, otherwise from the next line
                 price = 0.0
-                price_match = re.search(r'\$?(\d+(?:\.\d+)?)', description)
-                if price_match:
-                    price = float(price_match.group(1))
+                if item_match["price"]:
+                    price = float(item_match["price"])
                 elif i + 1 < len(lines):
-                    next_price_match = re.search(r'\$?(\d+(?:\.\d+)?)', lines[i + 1])
+                    next_price_match = _PRICE_RE.search(lines[i + 1])
                     if next_price_match:
                         price = float(next_price_match.group(1))
                 
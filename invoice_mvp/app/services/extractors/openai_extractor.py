@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-import json
 import os
-from typing import Dict, Any, Optional
+from typing import Any, BinaryIO, Dict, Optional
 
+import orjson
 from openai import AsyncOpenAI
+from pydantic import ValidationError
 
+from ...core import InvoiceLineItemWithTotals
 from .base import InvoiceExtractor, ExtractionMetrics
 
 
@@ -27,7 +29,7 @@ class OpenAIInvoiceExtractor(InvoiceExtractor):
 
     async def extract(
         self, 
-        file_bytes: bytes, 
+        file: BinaryIO, 
         filename: str,
         ocr_text: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -72,6 +74,8 @@ class OpenAIInvoiceExtractor(InvoiceExtractor):
                     {"role": "user", "content": user_prompt},
                 ],
                 temperature=0.1,
+                # JSON mode guarantees a bare JSON object (no markdown fences).
+                response_format={"type": "json_object"},
             )
         except Exception as exc:
             raise RuntimeError(f"OpenAI API call failed: {exc}") from exc
@@ -82,30 +86,46 @@ class OpenAIInvoiceExtractor(InvoiceExtractor):
             raise RuntimeError("Unexpected OpenAI API response format") from exc
 
         try:
-            data = json.loads(content)
-        except json.JSONDecodeError as exc:
+            data = orjson.loads(content)
+        except orjson.JSONDecodeError as exc:
             raise RuntimeError("OpenAI response was not valid JSON") from exc
 
         if not isinstance(data, dict):
             raise RuntimeError("OpenAI response JSON is not an object")
 
-        # Normalize with defaults
+        # Normalize with defaults. LLM output is untrusted, so this is where it
+        # gets validated; downstream mapping builds models without re-checking.
         provider = data.get("provider") or {}
         line_items = data.get("line_items") or []
         totals = data.get("totals") or {}
 
+        try:
+            validated_items = [
+                InvoiceLineItemWithTotals.model_validate(
+                    {
+                        "rubro_raw": li.get("rubro_raw") or "",
+                        "quantity": li.get("quantity") or 0,
+                        "unit_price": li.get("unit_price") or 0,
+                        "subtotal": li.get("subtotal") or 0,
+                    }
+                ).model_dump()
+                for li in line_items
+            ]
+        except (AttributeError, ValidationError) as exc:
+            raise RuntimeError(f"OpenAI response line_items are invalid: {exc}") from exc
+
         normalized = {
             "provider": {
-                "name": provider.get("name", ""),
-                "rut": provider.get("rut", ""),
-                "address": provider.get("address", ""),
+                "name": provider.get("name") or "",
+                "rut": provider.get("rut") or "",
+                "address": provider.get("address") or "",
             },
-            "line_items": line_items,
+            "line_items": validated_items,
             "totals": {
-                "subtotal": float(totals.get("subtotal", 0)),
-                "iva": float(totals.get("iva", 0)),
-                "iva_rate": float(totals.get("iva_rate", 0)),
-                "total": float(totals.get("total", 0)),
+                "subtotal": float(totals.get("subtotal") or 0),
+                "iva": float(totals.get("iva") or 0),
+                "iva_rate": float(totals.get("iva_rate") or 0),
+                "total": float(totals.get("total") or 0),
             },
         }
 
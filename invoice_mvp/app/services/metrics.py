@@ -2,36 +2,140 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import atexit
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Any
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional
 from pathlib import Path
 
+import orjson
+
 from .extractors.base import ExtractionMetrics
 
 
 class ExtractionMetricsCollector:
-    """Collects and analyzes extraction metrics."""
+    """Collects and analyzes extraction metrics.
+
+    Records are persisted as append-only JSON Lines. Writes are buffered and
+    flushed shortly after the first unflushed record (or immediately when no
+    event loop is running), so request handlers never rewrite the history.
+    Only the most recent ``max_recent`` records are kept in memory; provider
+    stats come from running aggregates and still cover the whole history.
+    """
 
-    def __init__(self, metrics_file: str = "extraction_metrics.json"):
+    def __init__(
+        self,
+        metrics_file: str = "extraction_metrics.jsonl",
+        flush_interval: float = 0.1,
+        max_recent: int = 10_000,
+    ):
         self.metrics_file = Path(metrics_file)
-        self.metrics: List[Dict[str, Any]] = []
+        self.metrics: Deque[Dict[str, Any]] = deque(maxlen=max_recent)
+        # Running per-provider sums, so stats never need to rescan history.
+        self._provider_aggs: Dict[str, Dict[str, Any]] = {}
+        self._flush_interval = flush_interval
+        self._buffer = bytearray()
+        self._flush_task: Optional[asyncio.Task] = None
+        # In-memory hit/miss counters for the result caches; not persisted.
+        self._cache_stats: Dict[str, Dict[str, int]] = {}
+        # Legacy JSON array still to be copied into the JSONL file; done on
+        # the first flush so merely loading the collector never writes.
+        self._migrate_from: Optional[Path] = None
         self._load_metrics()
 
     def _load_metrics(self) -> None:
-        """Load existing metrics from file."""
+        """Load existing metrics from file.
+
+        Lines are decoded and ingested one at a time, so only the recent
+        window and the aggregates are held in memory, never the full history.
+        """
+        legacy_file = self.metrics_file.with_suffix(".json")
         if self.metrics_file.exists():
             try:
-                with open(self.metrics_file, 'r') as f:
-                    self.metrics = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                self.metrics = []
+                with open(self.metrics_file, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            record = orjson.loads(line)
+                        except orjson.JSONDecodeError:
+                            continue  # Skip a torn trailing write
+                        self._ingest(record)
+            except IOError:
+                self.metrics.clear()
+                self._provider_aggs = {}
+        elif legacy_file != self.metrics_file and legacy_file.exists():
+            # One-time migration from the old single JSON array file.
+            for record in self._read_legacy(legacy_file):
+                self._ingest(record)
+            self._migrate_from = legacy_file
+
+    @staticmethod
+    def _read_legacy(legacy_file: Path) -> List[Dict[str, Any]]:
+        try:
+            return orjson.loads(legacy_file.read_bytes())
+        except (orjson.JSONDecodeError, IOError):
+            return []
+
+    def _ingest(self, record: Dict[str, Any]) -> None:
+        """Add a record to the recent window and the running aggregates."""
+        self.metrics.append(record)
+        self._aggregate(record)
+
+    def _aggregate(self, record: Dict[str, Any]) -> None:
+        """Fold one extraction record into the per-provider running sums."""
+        aggs = self._provider_aggs.get(record["provider"])
+        if aggs is None:
+            aggs = self._provider_aggs[record["provider"]] = {
+                "total_extractions": 0,
+                "successful_extractions": 0,
+                "failed_extractions": 0,
+                "sum_processing_time": 0.0,
+                "sum_confidence": 0.0,
+            }
+
+        aggs["total_extractions"] += 1
+        if record["success"]:
+            aggs["successful_extractions"] += 1
+        else:
+            aggs["failed_extractions"] += 1
+        aggs["sum_processing_time"] += record["processing_time"]
+        if record["confidence"]:
+            aggs["sum_confidence"] += record["confidence"].get("overall", 0.0)
 
-    def _save_metrics(self) -> None:
-        """Save metrics to file."""
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> bytes:
+        return orjson.dumps(record, default=str, option=orjson.OPT_APPEND_NEWLINE)
+
+    def _schedule_flush(self) -> None:
+        """Flush soon on the running loop, or right away outside of one."""
         try:
-            with open(self.metrics_file, 'w') as f:
-                json.dump(self.metrics, f, indent=2, default=str)
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._flush_interval)
+        self.flush()
+
+    def flush(self) -> None:
+        """Append buffered records to the metrics file."""
+        if not self._buffer:
+            return
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        if self._migrate_from is not None:
+            legacy = b"".join(self._encode(r) for r in self._read_legacy(self._migrate_from))
+            data = legacy + data
+            self._migrate_from = None
+        try:
+            with open(self.metrics_file, 'ab') as f:
+                f.write(data)
         except IOError:
             pass  # Silently fail if can't write
 
@@ -47,59 +151,55 @@ class ExtractionMetricsCollector:
             "error_message": metrics.error_message,
         }
         
-        self.metrics.append(record)
-        self._save_metrics()
+        self._ingest(record)
+        self._buffer += self._encode(record)
+        self._schedule_flush()
+
+    def record_cache_lookup(self, cache: str, hit: bool) -> None:
+        """Count a hit or miss on one of the result caches."""
+        stats = self._cache_stats.get(cache)
+        if stats is None:
+            stats = self._cache_stats[cache] = {"hits": 0, "misses": 0}
+        stats["hits" if hit else "misses"] += 1
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get hit/miss counters by cache since startup."""
+        return {name: dict(stats) for name, stats in self._cache_stats.items()}
 
     def get_provider_stats(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics by provider."""
         stats = {}
-        
-        for metric in self.metrics:
-            provider = metric["provider"]
-            if provider not in stats:
-                stats[provider] = {
-                    "total_extractions": 0,
-                    "successful_extractions": 0,
-                    "failed_extractions": 0,
-                    "avg_processing_time": 0.0,
-                    "avg_confidence": 0.0,
-                }
-            
-            provider_stats = stats[provider]
-            provider_stats["total_extractions"] += 1
-            
-            if metric["success"]:
-                provider_stats["successful_extractions"] += 1
-            else:
-                provider_stats["failed_extractions"] += 1
-            
-            provider_stats["avg_processing_time"] += metric["processing_time"]
-            
-            if metric["confidence"]:
-                provider_stats["avg_confidence"] += metric["confidence"].get("overall", 0.0)
-        
-        # Calculate averages
-        for provider_stats in stats.values():
-            if provider_stats["total_extractions"] > 0:
-                provider_stats["avg_processing_time"] /= provider_stats["total_extractions"]
-                provider_stats["avg_confidence"] /= provider_stats["total_extractions"]
-                provider_stats["success_rate"] = (
-                    provider_stats["successful_extractions"] / provider_stats["total_extractions"]
-                )
-            else:
-                provider_stats["success_rate"] = 0.0
-        
+
+        for provider, aggs in self._provider_aggs.items():
+            total = aggs["total_extractions"]
+            stats[provider] = {
+                "total_extractions": total,
+                "successful_extractions": aggs["successful_extractions"],
+                "failed_extractions": aggs["failed_extractions"],
+                "avg_processing_time": aggs["sum_processing_time"] / total,
+                "avg_confidence": aggs["sum_confidence"] / total,
+                "success_rate": aggs["successful_extractions"] / total,
+            }
+
         return stats
 
     def get_recent_extractions(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent extraction records."""
-        return self.metrics[-limit:] if self.metrics else []
+        return list(islice(self.metrics, max(0, len(self.metrics) - limit), None))
 
     def clear_metrics(self) -> None:
         """Clear all metrics."""
-        self.metrics = []
-        self._save_metrics()
+        self.metrics.clear()
+        self._provider_aggs = {}
+        self._cache_stats = {}
+        self._buffer.clear()
+        self._migrate_from = None
+        try:
+            self.metrics_file.write_bytes(b"")
+        except IOError:
+            pass
 
 
 # Global metrics collector instance
 metrics_collector = ExtractionMetricsCollector()
+atexit.register(metrics_collector.flush)
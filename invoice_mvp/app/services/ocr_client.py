@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Protocol
+from typing import BinaryIO, Protocol
 
 
 class OCRClient(ABC):
@@ -12,12 +12,12 @@ class OCRClient(ABC):
     """
 
     @abstractmethod
-    async def extract_text(self, file_bytes: bytes, filename: str) -> str:
-        """Extract raw text from a document (PDF or image)."""
+    async def extract_text(self, file: BinaryIO, filename: str) -> str:
+        """Extract raw text from a document (PDF or image) binary stream."""
 
 
 class MockOCRClient(OCRClient):
     """Mock OCR that ignores the file and returns a canned text snippet."""
 
-    async def extract_text(self, file_bytes: bytes, filename: str) -> str:  # type: ignore[override]
+    async def extract_text(self, file: BinaryIO, filename: str) -> str:  # type: ignore[override]
         return "Proveedor Demo RUT 12.345.678-9 Servicio de consultoría 10 x 100 = 1000 IVA 19% Total 1190"
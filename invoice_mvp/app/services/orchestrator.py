@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import os
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, cast
 
 from ..core import (
     Invoice,
@@ -8,13 +10,14 @@ from ..core import (
     InvoiceParty,
     InvoiceTotals,
     ProcessedInvoice,
-    InvoiceExtraction,
+    ExtractedInvoiceDict,
 )
 from .ocr_client import OCRClient
 from .rubro_normalizer import RubroNormalizerService
 from .validator import validate_invoice_numeric_consistency
 from .smart_extractor import SmartExtractorFactory
 from .metrics import metrics_collector
+from .result_cache import extraction_cache, file_sha256, ocr_cache
 
 
 class InvoiceProcessor:
@@ -33,94 +36,167 @@ class InvoiceProcessor:
         self._ocr = ocr_client
         self._smart_extractor = SmartExtractorFactory.create_extractor(extractor_provider)
         self._rubro_normalizer = rubro_normalizer
+        # The extractor fixes the result shape, so pick its mapper once.
+        self._map_to_invoice = _MAPPERS.get(
+            self._smart_extractor.get_provider_name(), _map_extracted_invoice
+        )
+
+    async def process_invoice_file(self, file: BinaryIO, filename: str) -> ProcessedInvoice:
+        # OCR and extraction results are memoized by file content. The
+        # extension is part of the key because it selects the OCR path.
+        # Hashing reads the whole upload, so skip it when caching is off.
+        use_ocr_cache = ocr_cache.maxsize > 0
+        use_extraction_cache = extraction_cache.maxsize > 0
+        if use_ocr_cache or use_extraction_cache:
+            digest = await asyncio.to_thread(file_sha256, file)
+            ext = os.path.splitext(filename)[1].lower()
+            ocr_key = (type(self._ocr), digest, ext)
+            extraction_key = (type(self._smart_extractor), ocr_key)
 
-    async def process_invoice_file(self, file_bytes: bytes, filename: str) -> ProcessedInvoice:
         # Step 1: OCR
-        ocr_text = await self._ocr.extract_text(file_bytes, filename)
+        ocr_text = None
+        if use_ocr_cache:
+            ocr_text = ocr_cache.get(ocr_key)
+            metrics_collector.record_cache_lookup("ocr", hit=ocr_text is not None)
+        if ocr_text is None:
+            ocr_text = await self._ocr.extract_text(file, filename)
+            if use_ocr_cache:
+                ocr_cache.put(ocr_key, ocr_text)
 
         # Step 2: Smart extraction with metrics
-        llm_result, extraction_metrics = await self._smart_extractor.extract_with_metrics(
-            file_bytes, filename, ocr_text
-        )
-        # Record metrics
-        metrics_collector.record_extraction(extraction_metrics, filename)
+        cached = None
+        if use_extraction_cache:
+            cached = extraction_cache.get(extraction_key)
+            metrics_collector.record_cache_lookup("extraction", hit=cached is not None)
+        if cached is None:
+            llm_result, extraction_metrics = await self._smart_extractor.extract_with_metrics(
+                file, filename, ocr_text
+            )
+            if use_extraction_cache:
+                extraction_cache.put(extraction_key, (llm_result, extraction_metrics))
+            # Record metrics (only for extractions that actually ran)
+            metrics_collector.record_extraction(extraction_metrics, filename)
+        else:
+            llm_result, extraction_metrics = cached
 
         # Step 3: Map into domain model
-        invoice = self._map_to_invoice(llm_result)
+        invoice, rubros_raw = self._map_to_invoice(llm_result)
 
         # Step 4: Optional rubro normalization
         if self._rubro_normalizer is not None:
-            normalization_results = self._rubro_normalizer.normalize_lines(
-                [li.rubro_raw for li in invoice.line_items]
-            )
-            for res in normalization_results:
+            normalization_results = self._rubro_normalizer.normalize_lines(rubros_raw)
+            for li, res in zip(invoice.line_items, normalization_results):
                 if res.normalized_code:
-                    invoice.line_items[res.line_index].rubro_code = res.normalized_code
+                    li.rubro_code = res.normalized_code
 
         # Step 5: Validation
         validation = validate_invoice_numeric_consistency(invoice)
 
-        return ProcessedInvoice(invoice=invoice, validation=validation)
-
-    def _map_to_invoice(self, data: dict) -> Invoice:
-        # Si viene en formato Llama Cloud, extraer de 'data' y usar InvoiceExtraction para validarlo
-        if "data" in data and "seller" in data["data"] and "buyer" in data["data"]:
-            extraction_data = data["data"]
-            extraction = InvoiceExtraction(**extraction_data)
-            
-            # Mapear de Llama al dominio existente
-            provider = InvoiceParty(
-                name=extraction.seller.name or "",
-                rut=extraction.seller.rut or "",
-                address=extraction.seller.address or ""
+        return ProcessedInvoice.model_construct(invoice=invoice, validation=validation)
+
+
+def _f(value: object) -> float:
+    """Coerce an extracted amount to float, treating None/empty as 0."""
+    return value if type(value) is float else float(value or 0)  # type: ignore[arg-type]
+
+
+def _map_llama_extraction(data: dict) -> Tuple[Invoice, List[str]]:
+    """Map a Llama Cloud result, collecting each line's raw rubro in the same pass."""
+    extraction_data = data.get("data")
+    if extraction_data is None:
+        return _map_extracted_invoice(data)
+
+    # Llama Cloud devuelve el payload en 'data', ya ajustado al schema del
+    # agente (core.InvoiceExtraction). Se lee el dict directamente en lugar de
+    # re-validarlo con pydantic; los campos faltantes quedan en sus defaults.
+    seller = extraction_data.get("seller") or {}
+    buyer_data = extraction_data.get("buyer") or {}
+
+    # Mapear de Llama al dominio existente
+    provider = InvoiceParty.model_construct(
+        name=seller.get("name") or "",
+        rut=seller.get("rut") or "",
+        address=seller.get("address") or ""
+    )
+
+    buyer = InvoiceParty.model_construct(
+        name=buyer_data.get("name") or "",
+        rut=buyer_data.get("rut") or "",
+        address=buyer_data.get("address") or ""
+    )
+
+    line_items = []
+    rubros_raw = []
+    for item in extraction_data.get("line_items") or []:
+        rubro_raw = item.get("description") or ""
+        line_items.append(
+            InvoiceLineItemWithTotals.model_construct(
+                rubro_raw=rubro_raw,
+                rubro_code=None,
+                quantity=_f(item.get("quantity")),
+                unit_price=0.0,  # Llama no da unit_price, se calculará después si es necesario
+                subtotal=0.0,   # Se calculará después si es necesario
             )
-            
-            buyer = InvoiceParty(
-                name=extraction.buyer.name or "",
-                rut=extraction.buyer.rut or "",
-                address=extraction.buyer.address or ""
-            )
-            
-            line_items = [
-                InvoiceLineItemWithTotals(
-                    rubro_raw=item.description or "",
-                    rubro_code=None,
-                    quantity=float(item.quantity or 0),
-                    unit_price=0.0,  # Llama no da unit_price, se calculará después si es necesario
-                    subtotal=0.0,   # Se calculará después si es necesario
-                )
-                for item in extraction.line_items
-            ]
-            
-            totals = InvoiceTotals(
-                subtotal=float(extraction.financial_summary.sub_total or 0),
-                iva=float(extraction.financial_summary.iva_amount or 0),
-                iva_rate=0.0,  # Llama no da tasa, se puede calcular si es necesario
-                total=float(extraction.financial_summary.total_amount or 0),
-            )
-            
-            return Invoice(provider=provider, buyer=buyer, line_items=line_items, totals=totals)
-        
-        # Si viene en formato antiguo (OpenAI/Mock), mapear como antes
-        provider_data = data.get("provider", {})
-        totals_data = data.get("totals", {})
-        line_items_data = data.get("line_items", [])
-
-        # Asegurar que todos los campos requeridos estén presentes
-        provider = InvoiceParty(
-            name=provider_data.get("name", ""),
-            rut=provider_data.get("rut", ""),
-            address=provider_data.get("address", "")
-        )
-        
-        totals = InvoiceTotals(
-            subtotal=float(totals_data.get("subtotal", 0)),
-            iva=float(totals_data.get("iva", 0)),
-            iva_rate=float(totals_data.get("iva_rate", 0)),
-            total=float(totals_data.get("total", 0)),
         )
-        
-        line_items = [InvoiceLineItemWithTotals(**li) for li in line_items_data]
-
-        return Invoice(provider=provider, buyer=InvoiceParty(), line_items=line_items, totals=totals)
-
+        rubros_raw.append(rubro_raw)
+
+    financial_summary = extraction_data.get("financial_summary") or {}
+    totals = InvoiceTotals.model_construct(
+        subtotal=_f(financial_summary.get("sub_total")),
+        iva=_f(financial_summary.get("iva_amount")),
+        iva_rate=0.0,  # Llama no da tasa, se puede calcular si es necesario
+        total=_f(financial_summary.get("total_amount")),
+    )
+
+    return Invoice.model_construct(
+        provider=provider, buyer=buyer, line_items=line_items, totals=totals
+    ), rubros_raw
+
+
+def _map_extracted_invoice(data: dict) -> Tuple[Invoice, List[str]]:
+    """Map the ExtractedInvoiceDict shape (OpenAI/OCR/Mock), collecting raw rubros."""
+    # Extractor output is already validated/normalized at the extractor
+    # boundary, so domain models are assembled with model_construct to skip
+    # re-validation.
+    legacy = cast(ExtractedInvoiceDict, data)
+    provider_data = legacy.get("provider", {})
+    totals_data = legacy.get("totals", {})
+    line_items_data = legacy.get("line_items", [])
+
+    # Asegurar que todos los campos requeridos estén presentes
+    provider = InvoiceParty.model_construct(
+        name=provider_data.get("name", ""),
+        rut=provider_data.get("rut", ""),
+        address=provider_data.get("address", "")
+    )
+
+    totals = InvoiceTotals.model_construct(
+        subtotal=_f(totals_data.get("subtotal")),
+        iva=_f(totals_data.get("iva")),
+        iva_rate=_f(totals_data.get("iva_rate")),
+        total=_f(totals_data.get("total")),
+    )
+
+    line_items = []
+    rubros_raw = []
+    for li in line_items_data:
+        item = InvoiceLineItemWithTotals.model_construct(**li)
+        line_items.append(item)
+        rubros_raw.append(item.rubro_raw)
+
+    return Invoice.model_construct(
+        provider=provider,
+        buyer=InvoiceParty.model_construct(),
+        line_items=line_items,
+        totals=totals,
+    ), rubros_raw
+
+
+# Result mappers keyed by InvoiceExtractor.get_provider_name(); providers not
+# listed here return the ExtractedInvoiceDict shape.
+_MAPPERS: Dict[str, Callable[[dict], Tuple[Invoice, List[str]]]] = {
+    "llama_cloud": _map_llama_extraction,
+    "openai": _map_extracted_invoice,
+    "tesseract_ocr": _map_extracted_invoice,
+    "mock": _map_extracted_invoice,
+}
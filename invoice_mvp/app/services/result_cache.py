@@ -0,0 +1,66 @@
+"""Content-addressed caches for OCR and extraction results.
+
+OCR and LLM extraction dominate request time, and clients commonly retry or
+re-upload the same file. Results are memoized under the SHA-256 of the file
+contents so a repeated upload skips both steps.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import BinaryIO, Generic, Hashable, Optional, TypeVar
+
+_V = TypeVar("_V")
+
+_CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(file: BinaryIO) -> str:
+    """Return the hex SHA-256 of a seekable stream, leaving it rewound."""
+    file.seek(0)
+    if hasattr(hashlib, "file_digest"):  # Python 3.11+
+        digest = hashlib.file_digest(file, "sha256")
+    else:
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+class LRUCache(Generic[_V]):
+    """Minimal in-process LRU map; a maxsize of 0 disables caching."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, _V] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[_V]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: _V) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE") or 512)
+
+# OCR text and (extraction result, metrics) pairs, cached independently so an
+# OCR hit can still feed a different extractor.
+ocr_cache: LRUCache[str] = LRUCache(_CACHE_SIZE)
+extraction_cache: LRUCache[tuple] = LRUCache(_CACHE_SIZE)
@@ -1,13 +1,30 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import dataclass
+import sys
+import unicodedata
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 
 from ..core import RubroNomenclatorEntry, RubroNormalizationResult
 
 
+def _exact_key(text: str) -> str:
+    """Case- and padding-insensitive lookup key for rubro names."""
+    return text.casefold().strip()
+
+
+def _normalize_key(text: str) -> str:
+    """Like _exact_key, but also ignoring accents (combining marks only).
+
+    Letters without a decomposition (ß, Ł, Cyrillic, CJK, symbols) are kept,
+    so distinct names do not collapse onto the same key.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold().strip()
+
+
 @dataclass
 class RubroNomenclator:
     """Simple in-memory nomenclator.
@@ -15,15 +32,22 @@ class RubroNomenclator:
     Architectural decision: keep this as a thin data holder so we can later
     replace it with a database or vector store-backed RAG without changing
     the orchestrator.
+
+    Lookups try the exact (case-insensitive) name first, then the
+    accent-insensitive ``by_name`` key. Accent-folded keys shared by entries
+    with different codes are ambiguous and left out of ``by_name``.
     """
 
     by_code: Dict[str, RubroNomenclatorEntry]
     by_name: Dict[str, RubroNomenclatorEntry]
+    by_exact_name: Dict[str, RubroNomenclatorEntry] = field(default_factory=dict)
 
     @classmethod
     def from_csv(cls, path: Path) -> "RubroNomenclator":
         by_code: Dict[str, RubroNomenclatorEntry] = {}
         by_name: Dict[str, RubroNomenclatorEntry] = {}
+        by_exact_name: Dict[str, RubroNomenclatorEntry] = {}
+        ambiguous: Set[str] = set()
         with path.open("r", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             for row in reader:
@@ -33,12 +57,44 @@ class RubroNomenclator:
                     continue
                 entry = RubroNomenclatorEntry(code=code, name=name)
                 by_code[code] = entry
-                by_name[name.lower()] = entry
-        return cls(by_code=by_code, by_name=by_name)
+                # Empty keys (whitespace-only names) would match every blank
+                # rubro, so they are never indexed. Interned keys hash once
+                # and compare by identity on hits.
+                exact = _exact_key(name)
+                if exact:
+                    # On duplicate names the first row wins.
+                    by_exact_name.setdefault(sys.intern(exact), entry)
+                key = _normalize_key(name)
+                if not key or key in ambiguous:
+                    continue
+                existing = by_name.get(key)
+                if existing is not None and existing.code != code:
+                    del by_name[key]
+                    ambiguous.add(key)
+                elif existing is None:
+                    by_name[sys.intern(key)] = entry
+        return cls(by_code=by_code, by_name=by_name, by_exact_name=by_exact_name)
 
     def normalize(self, rubro_raw: str) -> Optional[RubroNomenclatorEntry]:
-        # Trivial implementation: exact match by name (case-insensitive)
-        return self.by_name.get(rubro_raw.lower())
+        # Trivial implementation: exact match by name, then ignoring accents
+        entry = self.by_exact_name.get(_exact_key(rubro_raw))
+        if entry is None:
+            key = _normalize_key(rubro_raw)
+            entry = self.by_name.get(key) if key else None
+        return entry
+
+    def normalize_many(self, rubros: Iterable[str]) -> List[Optional[RubroNomenclatorEntry]]:
+        """Bulk variant of normalize() with lookups hoisted out of the loop."""
+        get_exact = self.by_exact_name.get
+        get = self.by_name.get
+        results: List[Optional[RubroNomenclatorEntry]] = []
+        for rubro_raw in rubros:
+            entry = get_exact(_exact_key(rubro_raw))
+            if entry is None:
+                key = _normalize_key(rubro_raw)
+                entry = get(key) if key else None
+            results.append(entry)
+        return results
 
 
 class RubroNormalizerService:
@@ -52,11 +108,13 @@ class RubroNormalizerService:
         self._nomenclator = nomenclator
 
     def normalize_lines(self, rubros: Iterable[str]) -> List[RubroNormalizationResult]:
+        """Normalize each rubro; returns no results when there is no nomenclator."""
+        if self._nomenclator is None:
+            return []
+        rubros = list(rubros)
+        entries = self._nomenclator.normalize_many(rubros)
         results: List[RubroNormalizationResult] = []
-        for idx, rubro_raw in enumerate(rubros):
-            entry: Optional[RubroNomenclatorEntry] = None
-            if self._nomenclator is not None:
-                entry = self._nomenclator.normalize(rubro_raw)
+        for idx, (rubro_raw, entry) in enumerate(zip(rubros, entries)):
             results.append(
                 RubroNormalizationResult(
                     line_index=idx,
@@ -3,16 +3,25 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import BinaryIO, Dict, Optional, Tuple
 
 from .extractors.base import InvoiceExtractor, ExtractionMetrics
 from .extractors.llama_extractor import LlamaInvoiceExtractor
 from .extractors.openai_extractor import OpenAIInvoiceExtractor
 from .extractors.ocr_extractor import OCRInvoiceExtractor
 
+# Extractors hold no per-request state, so one instance per provider is shared
+# by every request (and keeps its HTTP client warm).
+_instances: Dict[str, InvoiceExtractor] = {}
+
 
 class SmartExtractorFactory:
-    """Factory for creating invoice extractors with adaptive strategy selection."""
+    """Factory for creating invoice extractors with adaptive strategy selection.
+
+    Environment detection and extractor instances are cached for the process
+    lifetime; call invalidate_cache() after changing provider env vars.
+    """
 
     @staticmethod
     def create_extractor(
@@ -50,25 +59,39 @@ class SmartExtractorFactory:
         if provider not in providers:
             raise ValueError(f"Unknown provider: {provider}. Available: {list(providers.keys())}")
         
-        return providers[provider]()
+        extractor = _instances.get(provider)
+        if extractor is None:
+            extractor = _instances[provider] = providers[provider]()
+        return extractor
 
     @staticmethod
     def _auto_detect() -> InvoiceExtractor:
         """Auto-detect the best available provider."""
+        return SmartExtractorFactory._create_specific(SmartExtractorFactory._detect_provider())
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _detect_provider() -> str:
         # Check for Llama Cloud
         if os.getenv("LLAMA_API_KEY"):
-            return LlamaInvoiceExtractor()
+            return "llama"
         
         # Check for OpenAI
         if os.getenv("OPENAI_API_KEY"):
-            return OpenAIInvoiceExtractor()
+            return "openai"
         
         # Fallback to OCR-only
-        return OCRInvoiceExtractor()
+        return "ocr"
 
     @staticmethod
     def get_available_providers() -> list[str]:
         """Get list of available providers based on environment."""
+        # Copy so callers can't mutate the cached tuple's contents
+        return list(SmartExtractorFactory._available_providers())
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _available_providers() -> Tuple[str, ...]:
         available = []
         
         if os.getenv("LLAMA_API_KEY"):
@@ -80,9 +103,18 @@ class SmartExtractorFactory:
         # OCR and Mock are always available
         available.extend(["ocr", "mock"])
         
-        return available
+        return tuple(available)
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Forget cached env detection and extractor instances (e.g. in tests)."""
+        _instances.clear()
+        SmartExtractorFactory._detect_provider.cache_clear()
+        SmartExtractorFactory._available_providers.cache_clear()
+        SmartExtractorFactory.get_recommended_provider.cache_clear()
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_recommended_provider() -> str:
         """Get the recommended provider for current environment."""
         available = SmartExtractorFactory.get_available_providers()
@@ -104,7 +136,7 @@ except ImportError:
         def get_provider_name(self) -> str:
             return "mock"
         
-        async def extract(self, file_bytes: bytes, filename: str, ocr_text: Optional[str] = None) -> dict:
+        async def extract(self, file: BinaryIO, filename: str, ocr_text: Optional[str] = None) -> dict:
             return {"provider": {"name": "Mock Provider"}}
 
 
@@ -117,20 +149,20 @@ class SmartInvoiceExtractor:
 
     async def extract_with_fallback(
         self,
-        file_bytes: bytes,
+        file: BinaryIO,
         filename: str,
         ocr_text: Optional[str] = None
     ) -> tuple[dict, ExtractionMetrics]:
         """Extract with automatic fallback on failure."""
         try:
             # Try primary extractor
-            return await self.primary.extract_with_metrics(file_bytes, filename, ocr_text)
+            return await self.primary.extract_with_metrics(file, filename, ocr_text)
         except Exception as e:
             print(f"[SmartExtractor] Primary extractor failed: {e}. Trying fallback...")
             
             # Try fallback extractor
             try:
-                return await self.fallback.extract_with_metrics(file_bytes, filename, ocr_text)
+                return await self.fallback.extract_with_metrics(file, filename, ocr_text)
             except Exception as fallback_error:
                 # Both failed
                 metrics = ExtractionMetrics(
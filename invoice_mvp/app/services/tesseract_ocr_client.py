@@ -1,15 +1,38 @@
 from __future__ import annotations
 
-import io
+import asyncio
+import atexit
 import os
-from typing import List
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, List
 
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_path, pdfinfo_from_path
 from PIL import Image
 import pytesseract
 
 from .ocr_client import OCRClient
 
+# Upper bound on Tesseract subprocesses running at once across all requests,
+# so upload bursts do not oversubscribe the CPU. Every request shares this
+# one pool, which is the cap itself and keeps OCR from starving the loop's
+# default executor used for rasterizing and other blocking work.
+_OCR_CONCURRENCY = max(1, int(os.getenv("OCR_CONCURRENCY") or os.cpu_count() or 1))
+_ocr_executor = ThreadPoolExecutor(max_workers=_OCR_CONCURRENCY, thread_name_prefix="tesseract")
+atexit.register(_ocr_executor.shutdown, wait=False, cancel_futures=True)
+# Poppler (pdfinfo/pdftoppm) subprocesses get their own shared pool under the
+# same cap, so concurrent PDF uploads cannot spawn one per request on top of
+# the Tesseract workers.
+_pdf_executor = ThreadPoolExecutor(max_workers=_OCR_CONCURRENCY, thread_name_prefix="poppler")
+atexit.register(_pdf_executor.shutdown, wait=False, cancel_futures=True)
+# PDFs are rasterized this many pages at a time so only about two windows of
+# page images are alive at once, however long the document is.
+_PDF_PAGE_WINDOW = _OCR_CONCURRENCY
+# Runs of whitespace other than the line boundaries str.splitlines() uses.
+_WS_RE = re.compile(r"[^\S\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]+")
+
 
 class TesseractOCRClient(OCRClient):
     """OCRClient implementation backed by Tesseract.
@@ -17,7 +40,8 @@ class TesseractOCRClient(OCRClient):
     This class is purely infrastructure: it translates files (PDF/images)
     into plain text for the rest of the pipeline. It performs no business
     validation and exposes the same async interface as OCRClient while
-    internally using synchronous libraries.
+    internally using synchronous libraries, which run in worker threads so
+    PDF pages are recognized concurrently.
     """
 
     def __init__(self, tesseract_cmd: str | None = None) -> None:
@@ -25,46 +49,115 @@ class TesseractOCRClient(OCRClient):
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
-    async def extract_text(self, file_bytes: bytes, filename: str) -> str:  # type: ignore[override]
+    async def extract_text(self, file: BinaryIO, filename: str) -> str:  # type: ignore[override]
         try:
             ext = os.path.splitext(filename)[1].lower()
         except Exception:
             ext = ""
 
+        file.seek(0)
         if ext in {".png", ".jpg", ".jpeg"}:
-            return self._extract_from_image_bytes(file_bytes)
+            return await self._extract_from_image_file(file)
         if ext == ".pdf":
-            return self._extract_from_pdf_bytes(file_bytes)
+            return await self._extract_from_pdf_file(file)
 
         raise RuntimeError(f"Unsupported file format for OCR: '{ext or 'unknown'}'")
 
-    def _extract_from_image_bytes(self, file_bytes: bytes) -> str:
+    async def _extract_from_image_file(self, file: BinaryIO) -> str:
+        image = await asyncio.to_thread(self._load_image, file)
+        return await self._run_tesseract_async(image)
+
+    @staticmethod
+    def _load_image(file: BinaryIO) -> Image.Image:
+        # Decode once, off the event loop, into the single-channel raster
+        # Tesseract works on, so pytesseract hands it a third of the pixels.
         try:
-            image = Image.open(io.BytesIO(file_bytes))
+            with Image.open(file) as im:
+                im.load()
+                if "A" in im.getbands() or "transparency" in im.info:
+                    # Flatten onto white first, as pytesseract would, so text
+                    # on a transparent (0,0,0,0) background stays readable.
+                    rgba = im.convert("RGBA")
+                    flattened = Image.new("L", rgba.size, 255)
+                    flattened.paste(rgba.convert("L"), mask=rgba.getchannel("A"))
+                    return flattened
+                return im.convert("L")
         except Exception as exc:  # noqa: BLE001
             raise RuntimeError(f"Failed to open image for OCR: {exc}") from exc
 
-        return self._run_tesseract(image)
+    async def _extract_from_pdf_file(self, file: BinaryIO) -> str:
+        # Poppler reads PDFs from a path, so copy the stream in chunks to a
+        # named temp file rather than materializing it as one bytes object.
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+            await asyncio.to_thread(self._spool_to_file, file, tmp)
+            loop = asyncio.get_running_loop()
+            page_count = await loop.run_in_executor(_pdf_executor, self._pdf_page_count, tmp.name)
+
+            if not page_count:
+                raise RuntimeError("PDF appears to have no pages")
+
+            # Rasterize window i+1 (blocking, off the event loop) while the
+            # pages of window i are recognized in parallel.
+            texts: List[str] = []
+            pending: asyncio.Future[List[str]] | None = None
+            try:
+                for first in range(1, page_count + 1, _PDF_PAGE_WINDOW):
+                    last = min(first + _PDF_PAGE_WINDOW - 1, page_count)
+                    pages = await loop.run_in_executor(
+                        _pdf_executor, self._rasterize_pdf, tmp.name, first, last
+                    )
+                    if pending is not None:
+                        texts.extend(await pending)
+                    # Pages come back raw and are normalized once after joining.
+                    pending = asyncio.gather(
+                        *(self._run_tesseract_async(page, normalize=False) for page in pages)
+                    )
+                if pending is not None:
+                    texts.extend(await pending)
+            except BaseException:
+                if pending is not None:
+                    pending.cancel()
+                raise
+
+        # Preserve page boundaries as blank lines between pages to help LLM.
+        combined = "\n\n".join(texts)
+        return self._normalize_ocr_output(combined)
+
+    @staticmethod
+    def _spool_to_file(file: BinaryIO, tmp: BinaryIO) -> None:
+        shutil.copyfileobj(file, tmp)
+        tmp.flush()
 
-    def _extract_from_pdf_bytes(self, file_bytes: bytes) -> str:
+    @staticmethod
+    def _pdf_page_count(path: str) -> int:
         try:
-            # Convert all pages in the PDF to images.
-            pages: List[Image.Image] = convert_from_bytes(file_bytes)
+            return int(pdfinfo_from_path(path).get("Pages") or 0)
         except Exception as exc:  # noqa: BLE001
-            raise RuntimeError(f"Failed to convert PDF to images for OCR: {exc}") from exc
+            raise RuntimeError(f"Failed to read PDF info for OCR: {exc}") from exc
 
-        if not pages:
-            raise RuntimeError("PDF appears to have no pages")
-
-        texts: List[str] = []
-        for page in pages:
-            texts.append(self._run_tesseract(page))
+    @staticmethod
+    def _rasterize_pdf(path: str, first_page: int, last_page: int) -> List[Image.Image]:
+        try:
+            # One pdftoppm per window, bounded by _pdf_executor; parallelism
+            # comes from pipelining windows with OCR. Render straight to
+            # grayscale like the image path.
+            return convert_from_path(
+                path,
+                first_page=first_page,
+                last_page=last_page,
+                grayscale=True,
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise RuntimeError(f"Failed to convert PDF to images for OCR: {exc}") from exc
 
-        # Preserve page boundaries as blank lines between pages to help LLM.
-        combined = "\n\n".join(texts)
-        return self._normalize_ocr_output(combined)
+    async def _run_tesseract_async(self, image: Image.Image, normalize: bool = True) -> str:
+        run = self._run_tesseract if normalize else self._run_tesseract_raw
+        return await asyncio.get_running_loop().run_in_executor(_ocr_executor, run, image)
 
     def _run_tesseract(self, image: Image.Image) -> str:
+        return self._normalize_ocr_output(self._run_tesseract_raw(image))
+
+    def _run_tesseract_raw(self, image: Image.Image) -> str:
         try:
             raw_text = pytesseract.image_to_string(image)
         except pytesseract.TesseractNotFoundError as exc:
@@ -75,13 +168,10 @@ class TesseractOCRClient(OCRClient):
         except Exception as exc:  # noqa: BLE001
             raise RuntimeError(f"Tesseract OCR failed: {exc}") from exc
 
-        return self._normalize_ocr_output(raw_text)
+        return raw_text
 
     def _normalize_ocr_output(self, text: str) -> str:
-        # Normalize whitespace while preserving line breaks.
-        normalized_lines: List[str] = []
-        for line in text.splitlines():
-            stripped = " ".join(line.split())  # collapse internal whitespace
-            if stripped:
-                normalized_lines.append(stripped)
-        return "\n".join(normalized_lines)
+        # Normalize whitespace while preserving line breaks: collapse runs in
+        # one pass over the whole text, then drop blank lines.
+        text = _WS_RE.sub(" ", text)
+        return "\n".join(stripped for line in text.splitlines() if (stripped := line.strip()))
@@ -14,50 +14,54 @@ def validate_invoice_numeric_consistency(invoice: Invoice) -> InvoiceValidationR
 
     issues = []
 
-    # Check line subtotals
+    # Check line subtotals (attribute reads bound once per line)
     lines_subtotal = 0.0
     for idx, line in enumerate(invoice.line_items):
+        subtotal = line.subtotal
         expected = round(line.quantity * line.unit_price, 2)
-        if abs(line.subtotal - expected) > 0.01:
+        if abs(subtotal - expected) > 0.01:
             issues.append(
-                InvoiceValidationIssue(
+                InvoiceValidationIssue.model_construct(
                     code="line_subtotal_mismatch",
-                    message=f"Line {idx} subtotal {line.subtotal} != quantity*unit_price {expected}",
+                    message=f"Line {idx} subtotal {subtotal} != quantity*unit_price {expected}",
                     field=f"line_items[{idx}].subtotal",
                 )
             )
-        lines_subtotal += line.subtotal
+        lines_subtotal += subtotal
+
+    totals = invoice.totals
 
     # Check subtotal matches sum of lines
-    if abs(invoice.totals.subtotal - lines_subtotal) > 0.01:
+    if abs(totals.subtotal - lines_subtotal) > 0.01:
         issues.append(
-            InvoiceValidationIssue(
+            InvoiceValidationIssue.model_construct(
                 code="subtotal_mismatch",
-                message=f"Invoice subtotal {invoice.totals.subtotal} != sum of lines {lines_subtotal}",
+                message=f"Invoice subtotal {totals.subtotal} != sum of lines {lines_subtotal}",
                 field="totals.subtotal",
             )
         )
 
     # Check IVA amount
-    expected_iva = round(invoice.totals.subtotal * invoice.totals.iva_rate, 2)
-    if abs(invoice.totals.iva - expected_iva) > 0.01:
+    expected_iva = round(totals.subtotal * totals.iva_rate, 2)
+    if abs(totals.iva - expected_iva) > 0.01:
         issues.append(
-            InvoiceValidationIssue(
+            InvoiceValidationIssue.model_construct(
                 code="iva_mismatch",
-                message=f"IVA {invoice.totals.iva} != subtotal*iva_rate {expected_iva}",
+                message=f"IVA {totals.iva} != subtotal*iva_rate {expected_iva}",
                 field="totals.iva",
             )
         )
 
     # Check total
-    expected_total = round(invoice.totals.subtotal + invoice.totals.iva, 2)
-    if abs(invoice.totals.total - expected_total) > 0.01:
+    expected_total = round(totals.subtotal + totals.iva, 2)
+    if abs(totals.total - expected_total) > 0.01:
         issues.append(
-            InvoiceValidationIssue(
+            InvoiceValidationIssue.model_construct(
                 code="total_mismatch",
-                message=f"Total {invoice.totals.total} != subtotal+iva {expected_total}",
+                message=f"Total {totals.total} != subtotal+iva {expected_total}",
                 field="totals.total",
             )
         )
 
-    return InvoiceValidationResult(is_valid=len(issues) == 0, issues=issues)
+    # Issues are built from known-good literals, so skip model validation.
+    return InvoiceValidationResult.model_construct(is_valid=len(issues) == 0, issues=issues)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, Any
+from typing import Any, BinaryIO, Dict, Optional
 
 from app.services.extractors.base import InvoiceExtractor, ExtractionMetrics
 
@@ -15,7 +15,7 @@ class MockInvoiceExtractor(InvoiceExtractor):
 
     async def extract(
         self, 
-        file_bytes: bytes, 
+        file: BinaryIO, 
         filename: str,
         ocr_text: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -55,7 +55,7 @@ class MockInvoiceExtractor(InvoiceExtractor):
 class MockOCRClient:
     """Mock OCR client for testing."""
 
-    async def extract_text(self, file_bytes: bytes, filename: str) -> str:
+    async def extract_text(self, file: BinaryIO, filename: str) -> str:
         """Return mock OCR text for testing."""
         return """
         FACTURA A
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import io
+
 import pytest
 
 from app.core import ProcessedInvoice
@@ -21,7 +23,7 @@ async def test_invoice_processor_with_mocks() -> None:
         rubro_normalizer=normalizer
     )
 
-    processed = await processor.process_invoice_file(b"dummy", "dummy.pdf")
+    processed = await processor.process_invoice_file(io.BytesIO(b"dummy"), "dummy.pdf")
 
     assert isinstance(processed, ProcessedInvoice)
     assert processed.invoice.provider.name == "Proveedor Demo"
@@ -38,7 +40,235 @@ async def test_smart_extractor_factory() -> None:
     assert extractor.get_provider_name() == "mock"
     
     # Test extraction
-    result = await extractor.extract(b"dummy", "dummy.pdf")
+    result = await extractor.extract(io.BytesIO(b"dummy"), "dummy.pdf")
     assert "provider" in result
     assert result["provider"]["name"] == "Proveedor Demo"
 
+
+
+@pytest.mark.asyncio
+async def test_ocr_extractor_totals_single_scan() -> None:
+    """Subtotal lines must not be mistaken for the invoice total."""
+    from app.services.extractors.ocr_extractor import OCRInvoiceExtractor
+
+    text = await MockOCRClient().extract_text(io.BytesIO(b"dummy"), "dummy.pdf")
+    result = await OCRInvoiceExtractor().extract(io.BytesIO(b"dummy"), "dummy.pdf", text)
+
+    assert result["provider"]["rut"] == "12.345.678-9"
+    assert result["totals"] == {
+        "subtotal": 1000.0,
+        "iva": 190.0,
+        "iva_rate": 0.19,
+        "total": 1190.0,
+    }
+
+    extractor = OCRInvoiceExtractor()
+    # Leftmost match wins: an earlier undotted RUT beats a later dotted one.
+    assert extractor._extract_rut("Cliente 1234567-8\nProveedor RUT 12.345.678-9") == "1234567-8"
+    # Likewise the first total line wins, whichever label it uses.
+    assert extractor._extract_totals("Total General: 500\nIVA: 90\nTotal: 600")["total"] == 500.0
+
+
+def test_metrics_collector_provider_stats(tmp_path) -> None:
+    """Provider stats survive a reload from the metrics file."""
+    from app.services.extractors.base import ExtractionMetrics
+    from app.services.metrics import ExtractionMetricsCollector
+
+    metrics_file = tmp_path / "metrics.jsonl"
+    collector = ExtractionMetricsCollector(str(metrics_file))
+    collector.record_extraction(
+        ExtractionMetrics(provider="mock", processing_time=1.0, success=True, confidence={"overall": 0.8})
+    )
+    collector.record_extraction(
+        ExtractionMetrics(provider="mock", processing_time=3.0, success=False, error_message="boom")
+    )
+
+    expected = {
+        "mock": {
+            "total_extractions": 2,
+            "successful_extractions": 1,
+            "failed_extractions": 1,
+            "avg_processing_time": 2.0,
+            "avg_confidence": 0.4,
+            "success_rate": 0.5,
+        }
+    }
+    assert collector.get_provider_stats() == expected
+
+    # Stats cover records already evicted from the in-memory window.
+    reloaded = ExtractionMetricsCollector(str(metrics_file), max_recent=1)
+    assert reloaded.get_provider_stats() == expected
+    assert [r["success"] for r in reloaded.get_recent_extractions()] == [False]
+
+
+def test_rubro_normalizer_ignores_accents_case_and_padding(tmp_path) -> None:
+    from app.services.rubro_normalizer import RubroNomenclator
+
+    csv_path = tmp_path / "rubros.csv"
+    csv_path.write_text(
+        "code,name\n"
+        "R01,Servicio de Consultoría\n"
+        "R02,★★★\n"
+        "R03,サービス\n"
+        "R04,Servicio 1°\n"
+        "R05,Servicio 1\n"
+        "R06,Café\n"
+        "R07,Cafe\n"
+        "R08,Straße\n",
+        encoding="utf-8",
+    )
+    nomenclator = RubroNomenclator.from_csv(csv_path)
+    normalizer = RubroNormalizerService(nomenclator=nomenclator)
+
+    results = normalizer.normalize_lines(
+        ["  SERVICIO DE CONSULTORIA ", "Otro rubro", "", "   ", "★", "サービス", "STRASSE"]
+    )
+
+    assert [r.normalized_code for r in results] == ["R01", None, None, None, None, "R03", "R08"]
+    assert results[0].normalized_name == "Servicio de Consultoría"
+    assert nomenclator.normalize("") is None
+    assert nomenclator.normalize("★★★").code == "R02"
+    # Symbols and letters without a decomposition are not folded away.
+    assert nomenclator.normalize("Servicio 1°").code == "R04"
+    assert nomenclator.normalize("Servicio 1").code == "R05"
+    # Exact names win; an accent-folded key shared by two codes matches neither.
+    assert nomenclator.normalize("café").code == "R06"
+    assert nomenclator.normalize("CAFE").code == "R07"
+    assert nomenclator.normalize("Cafè") is None
+
+
+def test_smart_extractor_factory_caches_instances_and_env(monkeypatch) -> None:
+    from app.services.smart_extractor import SmartExtractorFactory
+
+    monkeypatch.delenv("LLAMA_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    SmartExtractorFactory.invalidate_cache()
+
+    assert SmartExtractorFactory.create_extractor("mock") is SmartExtractorFactory.create_extractor("mock")
+    assert SmartExtractorFactory.get_available_providers() == ["ocr", "mock"]
+
+    # Env changes are only picked up after an explicit invalidation.
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    assert SmartExtractorFactory.get_recommended_provider() == "ocr"
+    SmartExtractorFactory.invalidate_cache()
+    assert SmartExtractorFactory.get_recommended_provider() == "openai"
+    SmartExtractorFactory.invalidate_cache()
+
+
+def test_llama_mapper_reads_payload_with_defaults() -> None:
+    from app.services.orchestrator import _MAPPERS
+
+    invoice, rubros_raw = _MAPPERS["llama_cloud"](
+        {
+            "data": {
+                "seller": {"name": "Proveedor Demo", "rut": None},
+                "line_items": [{"description": "Servicio", "quantity": 2}],
+                "financial_summary": {"sub_total": 1000, "iva_amount": 220, "total_amount": 1220},
+            }
+        }
+    )
+
+    assert invoice.provider.name == "Proveedor Demo"
+    assert invoice.provider.rut == ""
+    assert invoice.buyer.name == ""
+    assert rubros_raw == ["Servicio"]
+    assert invoice.line_items[0].quantity == 2.0
+    assert invoice.totals.total == 1220.0
+
+
+@pytest.mark.asyncio
+async def test_invoice_processor_memoizes_by_file_content() -> None:
+    from app.services.metrics import metrics_collector
+    from app.services.result_cache import extraction_cache, ocr_cache
+
+    class CountingOCRClient(MockOCRClient):
+        calls = 0
+
+        async def extract_text(self, file, filename):  # type: ignore[override]
+            CountingOCRClient.calls += 1
+            return await super().extract_text(file, filename)
+
+    ocr_cache.clear()
+    extraction_cache.clear()
+    before = metrics_collector.get_cache_stats().get("extraction", {"hits": 0, "misses": 0})
+    processor = InvoiceProcessor(ocr_client=CountingOCRClient(), extractor_provider="mock")
+
+    first = await processor.process_invoice_file(io.BytesIO(b"same bytes"), "a.pdf")
+    second = await processor.process_invoice_file(io.BytesIO(b"same bytes"), "b.pdf")
+    await processor.process_invoice_file(io.BytesIO(b"other bytes"), "a.pdf")
+
+    assert CountingOCRClient.calls == 2
+    assert second.invoice.totals == first.invoice.totals
+    after = metrics_collector.get_cache_stats()["extraction"]
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 2
+
+
+@pytest.mark.parametrize("mode", ["RGBA", "LA", "P"])
+def test_tesseract_load_image_flattens_transparency_onto_white(mode: str) -> None:
+    from PIL import Image, ImageDraw
+
+    from app.services.tesseract_ocr_client import TesseractOCRClient
+
+    # Black "text" on a fully transparent black background.
+    image = Image.new("RGBA", (40, 20), (0, 0, 0, 0))
+    ImageDraw.Draw(image).rectangle((5, 5, 15, 15), fill=(0, 0, 0, 255))
+    if mode != "RGBA":
+        image = image.convert(mode)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    buffer.seek(0)
+
+    loaded = TesseractOCRClient._load_image(buffer)
+
+    assert loaded.mode == "L"
+    assert loaded.getpixel((10, 10)) < 64  # text stays dark
+    assert loaded.getpixel((30, 2)) > 192  # background comes out light
+
+
+def test_metrics_collector_migrates_legacy_file_on_first_flush(tmp_path) -> None:
+    import orjson
+
+    from app.services.extractors.base import ExtractionMetrics
+    from app.services.metrics import ExtractionMetricsCollector
+
+    legacy_record = {
+        "timestamp": "2024-01-01T00:00:00",
+        "filename": "old.pdf",
+        "provider": "openai",
+        "processing_time": 2.0,
+        "success": True,
+        "confidence": None,
+        "error_message": None,
+    }
+    (tmp_path / "metrics.json").write_bytes(orjson.dumps([legacy_record]))
+    metrics_file = tmp_path / "metrics.jsonl"
+
+    collector = ExtractionMetricsCollector(str(metrics_file))
+    assert collector.get_provider_stats()["openai"]["total_extractions"] == 1
+    assert not metrics_file.exists()  # loading alone never writes
+
+    collector.record_extraction(ExtractionMetrics(provider="mock", processing_time=1.0, success=True))
+
+    lines = metrics_file.read_bytes().splitlines()
+    assert [orjson.loads(line)["provider"] for line in lines] == ["openai", "mock"]
+
+
+@pytest.mark.asyncio
+async def test_invoice_processor_skips_hashing_when_cache_disabled(monkeypatch) -> None:
+    from app.services import orchestrator
+    from app.services.metrics import metrics_collector
+
+    def fail_hash(file):  # pragma: no cover - must not be called
+        raise AssertionError("file should not be hashed with caching disabled")
+
+    monkeypatch.setattr(orchestrator, "file_sha256", fail_hash)
+    monkeypatch.setattr(orchestrator.ocr_cache, "maxsize", 0)
+    monkeypatch.setattr(orchestrator.extraction_cache, "maxsize", 0)
+    before = metrics_collector.get_cache_stats()
+    processor = InvoiceProcessor(ocr_client=MockOCRClient(), extractor_provider="mock")
+
+    processed = await processor.process_invoice_file(io.BytesIO(b"dummy"), "dummy.pdf")
+
+    assert processed.invoice.provider.name == "Proveedor Demo"
+    assert metrics_collector.get_cache_stats() == before